@@ -1,23 +1,114 @@
+import asyncio
+import functools
+import importlib
 import json
+import time
+from collections import OrderedDict
 from typing import List, Optional
 
 from mcp.server.fastmcp import FastMCP
 
-from tools.nuclei import run_nuclei
-from tools.ffuf import run_ffuf
-from tools.wfuzz import run_wfuzz
-from tools.sqlmap import run_sqlmap
-from tools.nmap import run_nmap
-from tools.hashcat import run_hashcat
-from tools.httpx import run_httpx
-from tools.subfinder import run_subfinder
-from tools.tlsx import run_tlsx
-from tools.xsstrike import run_xsstrike
-from tools.ipinfo import run_ipinfo
-from tools.amass import amass_wrapper as amass_tool
-from tools.dirsearch import dirsearch_wrapper as dirsearch_tool
-from tools.gospider import gospider_wrapper, gospider_crawl_with_filter
-from tools.arjun import arjun_wrapper, arjun_bulk_scan, arjun_with_custom_payloads
+from tools._runner import dumps
+
+
+# MCP tool name -> (tools.* module, backend callable, cache successful results)
+#
+# Every wrapper below dispatches through _run/_call, which gives all tools the
+# same lazy import, worker-thread execution, caching and serialization.
+# Only read-only scans whose arguments fully determine the result are cached.
+TOOLS = {
+    "nuclei_scan_wrapper": ("nuclei", "run_nuclei", True),
+    "ffuf_wrapper": ("ffuf", "run_ffuf", False),
+    "wfuzz_wrapper": ("wfuzz", "run_wfuzz", False),
+    "sqlmap_wrapper": ("sqlmap", "run_sqlmap", False),
+    "nmap_wrapper": ("nmap", "run_nmap", True),
+    "hashcat_wrapper": ("hashcat", "run_hashcat", False),
+    "httpx_wrapper": ("httpx", "run_httpx", True),
+    "subfinder_wrapper": ("subfinder", "run_subfinder", True),
+    "tlsx_wrapper": ("tlsx", "run_tlsx", False),
+    "xsstrike_wrapper": ("xsstrike", "run_xsstrike", False),
+    "ipinfo_wrapper": ("ipinfo", "run_ipinfo", False),
+    "amass_wrapper": ("amass", "amass_wrapper", False),
+    "dirsearch_wrapper": ("dirsearch", "dirsearch_wrapper", True),
+    "gospider_scan": ("gospider", "gospider_wrapper", True),
+    "gospider_filtered_scan": ("gospider", "gospider_crawl_with_filter", True),
+    "arjun_scan": ("arjun", "arjun_wrapper", True),
+    "arjun_bulk_parameter_scan": ("arjun", "arjun_wrapper", True),
+    "arjun_custom_parameter_scan": ("arjun", "arjun_with_custom_payloads", True),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _tool(module: str, name: str):
+    """Import tools.<module> on first use and return its <name> callable."""
+    return getattr(importlib.import_module(f"tools.{module}"), name)
+
+
+# Recent results of read-only scans, keyed by backend and arguments, so a client
+# repeating an identical call shortly afterwards gets the previous answer back
+_CACHE_TTL = 60
+_CACHE_MAX = 256
+_result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _freeze(value):
+    """Convert list arguments to tuples so they can be part of a cache key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _succeeded(result) -> bool:
+    """Check the "success" flag of a tool result (dict or JSON string).
+
+    JSON strings are parsed, so this runs in the worker thread, not on the
+    event loop.
+    """
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except json.JSONDecodeError:
+            return False
+    return isinstance(result, dict) and bool(result.get("success"))
+
+
+def _run_checked(fn, *args, **kwargs):
+    """Call a backend and return its result along with whether it succeeded."""
+    result = fn(*args, **kwargs)
+    return result, _succeeded(result)
+
+
+async def _run(tool_name: str, *args, cache_bust: bool = False, **kwargs):
+    """Run the backend of an MCP tool in a worker thread and return its raw result.
+
+    With cache_bust set, a cached result is ignored and replaced by a fresh run.
+    """
+    module, name, cache = TOOLS[tool_name]
+    if not cache:
+        return await asyncio.to_thread(_tool(module, name), *args, **kwargs)
+
+    key = (module, name, _freeze(args), _freeze(sorted(kwargs.items())))
+    hit = _result_cache.get(key)
+    if hit and not cache_bust and time.monotonic() - hit[0] < _CACHE_TTL:
+        _result_cache.move_to_end(key)
+        return hit[1]
+
+    result, succeeded = await asyncio.to_thread(_run_checked, _tool(module, name), *args, **kwargs)
+    if succeeded:
+        # Timestamp the entry once the result is ready, not when the scan
+        # started, so that scans longer than the TTL are cached as well
+        _result_cache[key] = (time.monotonic(), result)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _CACHE_MAX:
+            _result_cache.popitem(last=False)
+    return result
+
+
+async def _call(tool_name: str, *args, cache_bust: bool = False, **kwargs) -> str:
+    """Run the backend of an MCP tool and return its result as a JSON string."""
+    result = await _run(tool_name, *args, cache_bust=cache_bust, **kwargs)
+    return result if isinstance(result, str) else dumps(result)
+
 
 # Create server
 mcp = FastMCP(name="secops-mcp",
@@ -26,7 +117,7 @@ mcp = FastMCP(name="secops-mcp",
 
 
 @mcp.tool()
-def nuclei_scan_wrapper(
+async def nuclei_scan_wrapper(
     target: str,
     templates: Optional[List[str]] = None,
     severity: Optional[str] = None,
@@ -43,11 +134,11 @@ def nuclei_scan_wrapper(
     Returns:
         JSON string containing scan results with findings array
     """
-    return run_nuclei(target, templates, severity, output_format)
+    return await _call("nuclei_scan_wrapper", target, templates, severity, output_format)
 
 
 @mcp.tool()
-def ffuf_wrapper(
+async def ffuf_wrapper(
     url: str,
     wordlist: str,
     filter_code: Optional[str] = "404",
@@ -62,11 +153,11 @@ def ffuf_wrapper(
     Returns:
         JSON string containing fuzzing results
     """
-    return run_ffuf(url, wordlist, filter_code)
+    return await _call("ffuf_wrapper", url, wordlist, filter_code)
 
 
 @mcp.tool()
-def wfuzz_wrapper(
+async def wfuzz_wrapper(
     url: str,
     wordlist: str,
     hide_code: Optional[str] = "404",
@@ -81,11 +172,11 @@ def wfuzz_wrapper(
     Returns:
         JSON string containing fuzzing results
     """
-    return run_wfuzz(url, wordlist, hide_code)
+    return await _call("wfuzz_wrapper", url, wordlist, hide_code)
 
 
 @mcp.tool()
-def sqlmap_wrapper(
+async def sqlmap_wrapper(
     url: str,
     risk: Optional[int] = 1,
     level: Optional[int] = 1,
@@ -100,30 +191,35 @@ def sqlmap_wrapper(
     Returns:
         JSON string containing scan results
     """
-    return run_sqlmap(url, risk, level)
+    return await _call("sqlmap_wrapper", url, risk, level)
 
 
 @mcp.tool()
-def nmap_wrapper(
+async def nmap_wrapper(
     target: str,
     ports: Optional[str] = None,
     scan_type: Optional[str] = "sV",
+    raw: bool = False,
+    cache_bust: bool = False,
 ) -> str:
     """Run an Nmap network scan on the specified target.
     
     Args:
-        target: The target IP or hostname to scan
+        target: The target IP, hostname or CIDR range to scan; several targets can be
+                separated by spaces or commas and are scanned in parallel
         ports: Specific ports to scan (e.g., "22,80,443")
         scan_type: Scan type options (e.g., "sV" for version detection, "sS" for SYN scan)
+        raw: Also include the raw nmap XML report (default: False)
+        cache_bust: Rescan even if the same scan ran within the last minute (default: False)
     
     Returns:
-        JSON string containing scan results in XML format
+        JSON string containing scanned hosts with their ports, states, services and versions
     """
-    return run_nmap(target, ports, scan_type)
+    return await _call("nmap_wrapper", target, ports, scan_type, raw, cache_bust=cache_bust)
 
 
 @mcp.tool()
-def hashcat_wrapper(
+async def hashcat_wrapper(
     hash_file: str,
     wordlist: str,
     hash_type: str,
@@ -138,13 +234,14 @@ def hashcat_wrapper(
     Returns:
         JSON string containing cracking results
     """
-    return run_hashcat(hash_file, wordlist, hash_type)
+    return await _call("hashcat_wrapper", hash_file, wordlist, hash_type)
 
 
 @mcp.tool()
-def httpx_wrapper(
+async def httpx_wrapper(
     urls: List[str],
     status_codes: Optional[List[int]] = None,
+    cache_bust: bool = False,
 ) -> str:
     """Run httpx to probe HTTP servers and discover endpoints.
     
@@ -154,6 +251,7 @@ def httpx_wrapper(
         status_codes: Optional list of HTTP status codes to filter results
               Example: [200, 301, 404] - only returns results with these status codes
               If not provided, returns all status codes
+        cache_bust: Probe again even if the same URLs were probed within the last minute
     
     Returns:
         JSON string containing probe results with discovered endpoints, status codes, titles, etc.
@@ -165,34 +263,45 @@ def httpx_wrapper(
         - Max redirects: 3
         - Overall timeout: 30 seconds maximum
         - Scans typically complete in 2-10 seconds for a single URL
+        - All URLs are probed by a single httpx process (multiple URLs are piped via stdin)
+        - Duplicate and blank URLs are dropped before probing
+        - Successful results are reused for 60 seconds, regardless of URL order
     
     Example usage:
         - Single URL: httpx_wrapper(["https://hackerdogs.ai"])
         - Multiple URLs: httpx_wrapper(["https://site1.com", "http://site2.com"])
         - With status filter: httpx_wrapper(["https://example.com"], [200, 301])
     """
-    return run_httpx(urls, status_codes)
+    # Hand the whole batch to one run_httpx call so it is probed by a single
+    # httpx process instead of one process per URL; sorting lets the same set of
+    # URLs in a different order hit the result cache
+    targets = sorted({url.strip() for url in urls if url and url.strip()})
+    if status_codes:
+        status_codes = sorted(set(status_codes))
+    return await _call("httpx_wrapper", targets, status_codes, cache_bust=cache_bust)
 
 
 @mcp.tool()
-def subfinder_wrapper(
+async def subfinder_wrapper(
     domain: str,
     recursive: bool = False,
+    cache_bust: bool = False,
 ) -> str:
     """Run subfinder to enumerate subdomains.
     
     Args:
         domain: Target domain to enumerate
         recursive: Whether to perform recursive enumeration
+        cache_bust: Enumerate again even if the domain was enumerated within the last minute
     
     Returns:
         JSON string containing enumeration results with subdomains array
     """
-    return run_subfinder(domain, recursive)
+    return await _call("subfinder_wrapper", domain, recursive, cache_bust=cache_bust)
 
 
 @mcp.tool()
-def tlsx_wrapper(
+async def tlsx_wrapper(
     host: str,
     port: Optional[int] = 443,
 ) -> str:
@@ -205,11 +314,11 @@ def tlsx_wrapper(
     Returns:
         JSON string containing TLS analysis results
     """
-    return run_tlsx(host, port)
+    return await _call("tlsx_wrapper", host, port)
 
 
 @mcp.tool()
-def xsstrike_wrapper(
+async def xsstrike_wrapper(
     url: str,
     crawl: bool = False,
 ) -> str:
@@ -222,11 +331,11 @@ def xsstrike_wrapper(
     Returns:
         JSON string containing scan results
     """
-    return run_xsstrike(url, crawl)
+    return await _call("xsstrike_wrapper", url, crawl)
 
 
 @mcp.tool()
-def ipinfo_wrapper(
+async def ipinfo_wrapper(
     ip: Optional[str] = None,
 ) -> str:
     """Get IP information using ipinfo.io.
@@ -237,11 +346,11 @@ def ipinfo_wrapper(
     Returns:
         JSON string containing IP information (location, ISP, etc.)
     """
-    return run_ipinfo(ip)
+    return await _call("ipinfo_wrapper", ip)
 
 
 @mcp.tool()
-def amass_wrapper(
+async def amass_wrapper(
     domain: str,
     passive: bool = True,
 ) -> str:
@@ -254,12 +363,11 @@ def amass_wrapper(
     Returns:
         JSON string containing discovered subdomains with addresses and sources
     """
-    result = amass_tool(domain, passive)
-    return json.dumps(result, indent=2)
+    return await _call("amass_wrapper", domain, passive)
 
 
 @mcp.tool()
-def dirsearch_wrapper(
+async def dirsearch_wrapper(
     url: str,
     extensions: Optional[List[str]] = None,
     wordlist: Optional[str] = None,
@@ -274,12 +382,11 @@ def dirsearch_wrapper(
     Returns:
         JSON string containing discovered paths and their status codes
     """
-    result = dirsearch_tool(url, extensions, wordlist)
-    return json.dumps(result, indent=2)
+    return await _call("dirsearch_wrapper", url, extensions, wordlist)
 
 
 @mcp.tool()
-def gospider_scan(
+async def gospider_scan(
     target: str,
     depth: int = 3,
     concurrent: int = 10,
@@ -306,7 +413,8 @@ def gospider_scan(
     Returns:
         JSON string containing discovered URLs, forms, and secrets
     """
-    result = gospider_wrapper(
+    return await _call(
+        "gospider_scan",
         target=target,
         depth=depth,
         concurrent=concurrent,
@@ -317,11 +425,10 @@ def gospider_scan(
         include_other_source=include_other_source,
         output_format=output_format
     )
-    return json.dumps(result, indent=2)
 
 
 @mcp.tool()
-def gospider_filtered_scan(
+async def gospider_filtered_scan(
     target: str,
     extensions: Optional[List[str]] = None,
     exclude_extensions: Optional[List[str]] = None,
@@ -346,7 +453,8 @@ def gospider_filtered_scan(
     Returns:
         JSON string containing filtered crawling results
     """
-    result = gospider_crawl_with_filter(
+    return await _call(
+        "gospider_filtered_scan",
         target=target,
         extensions=extensions,
         exclude_extensions=exclude_extensions,
@@ -356,11 +464,10 @@ def gospider_filtered_scan(
         timeout=timeout,
         include_subs=include_subs
     )
-    return json.dumps(result, indent=2)
 
 
 @mcp.tool()
-def arjun_scan(
+async def arjun_scan(
     url: str,
     method: str = "GET",
     wordlist: Optional[str] = None,
@@ -389,7 +496,8 @@ def arjun_scan(
     Returns:
         JSON string containing discovered parameters
     """
-    result = arjun_wrapper(
+    return await _call(
+        "arjun_scan",
         url=url,
         method=method,
         wordlist=wordlist,
@@ -401,16 +509,16 @@ def arjun_scan(
         stable=stable,
         output_format=output_format
     )
-    return json.dumps(result, indent=2)
 
 
 @mcp.tool()
-def arjun_bulk_parameter_scan(
+async def arjun_bulk_parameter_scan(
     urls: List[str],
     method: str = "GET",
     wordlist: Optional[str] = None,
     threads: int = 25,
-    stable: bool = False
+    stable: bool = False,
+    max_concurrent: int = 8
 ) -> str:
     """Run Arjun parameter discovery on multiple URLs.
     
@@ -420,22 +528,31 @@ def arjun_bulk_parameter_scan(
         wordlist: Custom wordlist file path
         threads: Number of threads to use (default: 25)
         stable: Use stable mode for fewer false positives (default: False)
+        max_concurrent: Maximum number of Arjun processes running at once (default: 8)
     
     Returns:
         JSON string containing aggregated results from all scanned URLs
     """
-    result = arjun_bulk_scan(
-        urls=urls,
-        method=method,
-        wordlist=wordlist,
-        threads=threads,
-        stable=stable
-    )
-    return json.dumps(result, indent=2)
+    # Scan URLs concurrently, bounded by a semaphore to cap the process count
+    sem = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def scan(url: str):
+        async with sem:
+            return await _run(
+                "arjun_bulk_parameter_scan",
+                url=url,
+                method=method,
+                wordlist=wordlist,
+                threads=threads,
+                stable=stable
+            )
+
+    scans = await asyncio.gather(*(scan(url) for url in urls), return_exceptions=True)
+    return dumps(_tool("arjun", "arjun_bulk_scan")(urls, scans, method))
 
 
 @mcp.tool()
-def arjun_custom_parameter_scan(
+async def arjun_custom_parameter_scan(
     url: str,
     method: str = "GET",
     custom_params: Optional[List[str]] = None,
@@ -458,7 +575,8 @@ def arjun_custom_parameter_scan(
     Returns:
         JSON string containing results with custom parameter testing
     """
-    result = arjun_with_custom_payloads(
+    return await _call(
+        "arjun_custom_parameter_scan",
         url=url,
         method=method,
         custom_params=custom_params,
@@ -467,7 +585,6 @@ def arjun_custom_parameter_scan(
         threads=threads,
         stable=stable
     )
-    return json.dumps(result, indent=2)
 
 
 if __name__ == "__main__":
@@ -2,12 +2,23 @@
 """Test MCP server using MCP client library."""
 
 import json
+import re
 import sys
-import subprocess
+import traceback
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Dict, Any
 
 
+# main.py source and the tool-definition pattern, read and compiled once
+_MAIN_PY = Path(__file__).with_name("main.py").read_text()
+_TOOL_RE = re.compile(
+    r'@mcp\.tool\(\)\s+(?:async\s+)?def\s+(\w+)\(([^)]*)\)\s*->\s*str:',
+    re.MULTILINE | re.DOTALL
+)
+
+
 def test_tools_direct():
     """Test tools directly without MCP."""
     print("="*70)
@@ -16,14 +27,26 @@ def test_tools_direct():
     
     results = []
     
+    def probe_ipinfo():
+        from tools.ipinfo import run_ipinfo
+        return run_ipinfo()
+    
+    def probe_httpx():
+        from tools.httpx import run_httpx
+        return run_httpx(["https://hackerdogs.ai"])
+    
+    # Both probes are network-bound, so run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ipinfo_future = executor.submit(probe_ipinfo)
+        httpx_future = executor.submit(probe_httpx)
+    
     # Test ipinfo
     print("\n1. Testing ipinfo...")
     try:
-        from tools.ipinfo import run_ipinfo
-        result = run_ipinfo()
-        data = json.loads(result)
-        if 'ip' in data:
-            print(f"   ✓ ipinfo works - IP: {data.get('ip', 'N/A')}")
+        result = ipinfo_future.result()
+        # Only the presence of the "ip" key matters, so skip parsing the document
+        if '"ip"' in result and '"ip": null' not in result:
+            print(f"   ✓ ipinfo works")
             results.append(True)
         else:
             print(f"   ✗ ipinfo returned unexpected format")
@@ -35,11 +58,10 @@ def test_tools_direct():
     # Test httpx error handling
     print("\n2. Testing httpx error handling...")
     try:
-        from tools.httpx import run_httpx
-        result = run_httpx(["https://hackerdogs.ai"])
-        data = json.loads(result)
-        if not data.get('success'):
-            error = data.get('error', '')
+        result = httpx_future.result()
+        # Parse the result only when the error message has to be inspected
+        if '"success":false' in result:
+            error = json.loads(result).get('error', '')
             if 'Wrong httpx binary' in error or 'not found' in error or 'projectdiscovery' in error:
                 print(f"   ✓ httpx error handling works - clear error message")
                 results.append(True)
@@ -56,7 +78,7 @@ def test_tools_direct():
     return all(results)
 
 
-def test_mcp_server_via_stdio():
+async def test_mcp_server_via_stdio():
     """Test MCP server by running it and sending protocol messages."""
     print("\n" + "="*70)
     print("MCP Server Protocol Test (via stdio)")
@@ -65,13 +87,11 @@ def test_mcp_server_via_stdio():
     try:
         # Start the server as a subprocess
         print("\nStarting MCP server...")
-        server = subprocess.Popen(
-            [sys.executable, "main.py"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=0
+        server = await asyncio.create_subprocess_exec(
+            sys.executable, "main.py",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
         
         # Send initialize request
@@ -90,26 +110,27 @@ def test_mcp_server_via_stdio():
         }
         
         print("Sending initialize request...")
-        server.stdin.write(json.dumps(init_request) + "\n")
-        server.stdin.flush()
-        
-        # Read response with timeout
-        import select
-        import time
+        server.stdin.write(json.dumps(init_request).encode() + b"\n")
+        await server.stdin.drain()
         
+        # Read response with timeout - readline wakes up as soon as a line arrives
         timeout = 2
-        start = time.time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
         response = None
         
-        while time.time() - start < timeout:
-            if select.select([server.stdout], [], [], 0.1)[0]:
-                line = server.stdout.readline()
-                if line:
-                    try:
-                        response = json.loads(line.strip())
-                        break
-                    except:
-                        continue
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                line = await asyncio.wait_for(server.stdout.readline(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            try:
+                response = json.loads(line)
+                break
+            except json.JSONDecodeError:
+                continue
         
         if response:
             print(f"✓ Received response: {response.get('method', 'response')}")
@@ -119,8 +140,9 @@ def test_mcp_server_via_stdio():
             print("⚠ No response received (server may need MCP library installed)")
         
         # Clean up
-        server.terminate()
-        server.wait(timeout=1)
+        if server.returncode is None:
+            server.terminate()
+        await asyncio.wait_for(server.wait(), timeout=1)
         
         return True
         
@@ -139,18 +161,12 @@ def test_tool_registration():
     print("="*70)
     
     try:
-        # Read main.py and count @mcp.tool decorators
-        with open("main.py", "r") as f:
-            content = f.read()
-        
         # Count tool decorators
-        tool_count = content.count("@mcp.tool()")
+        tool_count = _MAIN_PY.count("@mcp.tool()")
         print(f"\n✓ Found {tool_count} @mcp.tool() decorators")
         
         # List tool names
-        import re
-        tool_pattern = r'@mcp\.tool\(\)\s+def\s+(\w+)'
-        tools = re.findall(tool_pattern, content)
+        tools = [match.group(1) for match in _TOOL_RE.finditer(_MAIN_PY)]
         
         print(f"\n✓ Registered tools ({len(tools)}):")
         for i, tool in enumerate(tools, 1):
@@ -178,8 +194,10 @@ def test_tool_registration():
             'arjun_custom_parameter_scan'
         ]
         
-        missing = [t for t in expected_tools if t not in tools]
-        extra = [t for t in tools if t not in expected_tools]
+        expected = set(expected_tools)
+        found = set(tools)
+        missing = sorted(expected - found)
+        extra = sorted(found - expected)
         
         if missing:
             print(f"\n⚠ Missing expected tools: {missing}")
@@ -193,7 +211,6 @@ def test_tool_registration():
         
     except Exception as e:
         print(f"✗ Tool registration test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -205,14 +222,8 @@ def test_tool_signatures():
     print("="*70)
     
     try:
-        import re
-        
-        with open("main.py", "r") as f:
-            content = f.read()
-        
         # Extract tool definitions
-        tool_pattern = r'@mcp\.tool\(\)\s+def\s+(\w+)\(([^)]*)\)\s*->\s*str:'
-        matches = re.finditer(tool_pattern, content, re.MULTILINE | re.DOTALL)
+        matches = _TOOL_RE.finditer(_MAIN_PY)
         
         tools_checked = 0
         issues = []
@@ -266,7 +277,7 @@ def main():
     results.append(("Tool Signatures", test_tool_signatures()))
     
     # Test 4: MCP Protocol (may fail if MCP not installed)
-    results.append(("MCP Protocol", test_mcp_server_via_stdio()))
+    results.append(("MCP Protocol", asyncio.run(test_mcp_server_via_stdio())))
     
     # Summary
     print("\n" + "="*70)
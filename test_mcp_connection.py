@@ -2,11 +2,20 @@
 """Test MCP server connection and tool discovery using MCP client."""
 
 import json
+import re
 import sys
 import asyncio
 from typing import List, Dict, Any
 
 
+# Tool definitions in main.py and the docstring that follows each one
+_TOOL_RE = re.compile(
+    r'@mcp\.tool\(\)\s+(?:async\s+)?def\s+(\w+)\(([^)]*)\)\s*->\s*str:',
+    re.MULTILINE | re.DOTALL
+)
+_DOC_RE = re.compile(r'\s*"""(.+?)"""', re.DOTALL)
+
+
 async def test_mcp_client_connection():
     """Test MCP server using Python MCP client library."""
     print("="*70)
@@ -119,11 +128,8 @@ def test_without_mcp_library():
         with open("main.py", "r") as f:
             content = f.read()
         
-        import re
-        
         # Find all tool definitions
-        tool_pattern = r'@mcp\.tool\(\)\s+def\s+(\w+)\(([^)]*)\)\s*->\s*str:'
-        matches = list(re.finditer(tool_pattern, content, re.MULTILINE | re.DOTALL))
+        matches = list(_TOOL_RE.finditer(content))
         
         print(f"✓ Found {len(matches)} MCP tool definitions:\n")
         
@@ -139,15 +145,11 @@ def test_without_mcp_library():
                     param_name = param.split(':')[0].split('=')[0].strip()
                     params.append(param_name)
             
-            # Get docstring (next few lines after function definition)
-            lines = content[match.end():match.end()+500].split('\n')
+            # Get docstring summary (first line of the docstring right after the definition)
             docstring = ""
-            for line in lines[:10]:
-                if '"""' in line or "'''" in line:
-                    # Extract docstring
-                    if '"""' in line:
-                        docstring = line.split('"""')[1] if '"""' in line else ""
-                    break
+            doc_match = _DOC_RE.match(content, match.end())
+            if doc_match:
+                docstring = doc_match.group(1).strip().split('\n', 1)[0]
             
             print(f"  {i:2}. {tool_name}")
             print(f"      Parameters: {', '.join(params) if params else 'None'}")
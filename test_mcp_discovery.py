@@ -1,12 +1,59 @@
 #!/usr/bin/env python3
 """Test MCP server tool discovery and execution."""
 
+import asyncio
+import functools
+import inspect
+import io
 import json
 import sys
 import subprocess
+import threading
 from typing import Dict, Any, List
 
 
+class _ThreadLocalStdout(io.TextIOBase):
+    """sys.stdout replacement that can capture each thread's output separately.
+    
+    Tests run concurrently in worker threads; capturing per thread keeps each
+    test's report intact so it can be printed in order afterwards.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def capture(self, test):
+        """Run a test, returning (result or raised exception, captured output)."""
+        self._local.buffer = buffer = io.StringIO()
+        try:
+            return test(), buffer.getvalue()
+        except Exception as e:
+            return e, buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
+
+@functools.cache
+def _load_main():
+    """Import the server module once and share it between the tests."""
+    import main
+    return main
+
+
+@functools.cache
+def _main_functions():
+    """(name, function) pairs of the server module, collected once."""
+    return [(name, obj) for name, obj in inspect.getmembers(_load_main()) if inspect.isfunction(obj)]
+
+
 def test_mcp_tools_direct():
     """Test tools directly (without MCP)."""
     print("="*70)
@@ -49,7 +96,7 @@ def test_mcp_server_startup():
     
     try:
         # Try to import and check server
-        import main
+        main = _load_main()
         print("✓ MCP server module imports successfully")
         print(f"✓ Server name: {main.mcp.name}")
         print(f"✓ Server version: {main.mcp.version}")
@@ -72,7 +119,7 @@ def test_mcp_tool_discovery():
     
     try:
         # Import the server
-        import main
+        main = _load_main()
         
         # Get all registered tools
         # FastMCP stores tools in _tools attribute
@@ -92,9 +139,8 @@ def test_mcp_tool_discovery():
             # Try alternative way to get tools
             print("\n⚠ Could not access tools directly, checking via attributes...")
             # List all @mcp.tool decorated functions
-            import inspect
-            for name, obj in inspect.getmembers(main):
-                if inspect.isfunction(obj) and hasattr(obj, '__wrapped__'):
+            for name, obj in _main_functions():
+                if hasattr(obj, '__wrapped__'):
                     print(f"  • {name}")
         
         return True
@@ -136,15 +182,12 @@ def test_tool_signatures():
     print("Tool Signature Verification")
     print("="*70)
     
-    import main
-    import inspect
-    
     issues = []
     tools_checked = 0
     
     # Get all tool functions from main
-    for name, obj in inspect.getmembers(main):
-        if inspect.isfunction(obj) and name.endswith('_wrapper'):
+    for name, obj in _main_functions():
+        if name.endswith('_wrapper'):
             tools_checked += 1
             sig = inspect.signature(obj)
             params = list(sig.parameters.keys())
@@ -166,29 +209,41 @@ def test_tool_signatures():
     return len(issues) == 0
 
 
-def main():
+async def main():
     """Run all tests."""
     print("="*70)
     print("MCP Server Comprehensive Test Suite")
     print("="*70)
     
-    results = []
-    
-    # Test 1: Direct tool testing
-    test_mcp_tools_direct()
-    results.append(("Direct Tools", True))
+    tests = [
+        ("Direct Tools", test_mcp_tools_direct),
+        ("Server Startup", test_mcp_server_startup),
+        ("Tool Discovery", test_mcp_tool_discovery),
+        ("Tool Signatures", test_tool_signatures),
+        ("MCP Protocol", test_mcp_protocol),
+    ]
     
-    # Test 2: Server startup
-    results.append(("Server Startup", test_mcp_server_startup()))
-    
-    # Test 3: Tool discovery
-    results.append(("Tool Discovery", test_mcp_tool_discovery()))
-    
-    # Test 4: Tool signatures
-    results.append(("Tool Signatures", test_tool_signatures()))
+    # The tests are independent and mostly wait on the network, subprocesses
+    # or imports, so run them concurrently and print their reports in order
+    stdout = _ThreadLocalStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        outcomes = await asyncio.gather(
+            *(asyncio.to_thread(stdout.capture, test) for _, test in tests)
+        )
+    finally:
+        sys.stdout = stdout.stream
     
-    # Test 5: MCP Protocol
-    results.append(("MCP Protocol", test_mcp_protocol()))
+    results = []
+    for (name, test), (result, output) in zip(tests, outcomes):
+        print(output, end="")
+        if isinstance(result, Exception):
+            print(f"✗ {name} raised: {result}")
+            result = False
+        elif test is test_mcp_tools_direct:
+            # Direct tool testing only reports what it found
+            result = True
+        results.append((name, result))
     
     # Summary
     print("\n" + "="*70)
@@ -213,5 +268,5 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(asyncio.run(main()))
 
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Test the tool helpers and the result cache without running any scanner."""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+
+def check(description: str, actual, expected) -> bool:
+    """Print and return whether actual matches expected."""
+    if actual == expected:
+        print(f"  ✓ {description}")
+        return True
+    print(f"  ✗ {description}: expected {expected!r}, got {actual!r}")
+    return False
+
+
+def _rejects(function, *args) -> bool:
+    """Return whether function raises ValueError for args."""
+    try:
+        function(*args)
+    except ValueError:
+        return True
+    return False
+
+
+def test_nmap_targets():
+    """Test how nmap targets are split and sharded."""
+    print("="*70)
+    print("Nmap Target Splitting")
+    print("="*70)
+
+    from tools.nmap import _split_targets, _shard_targets, run_nmap
+
+    results = [
+        # nmap octet lists must reach nmap unchanged, never as separate hosts
+        check("octet list 192.168.1,2.1 is kept whole",
+              _split_targets("192.168.1,2.1"), ["192.168.1,2.1"]),
+        check("octet range 10.0.0.1-5,7 is kept whole",
+              _split_targets("10.0.0.1-5,7"), ["10.0.0.1-5,7"]),
+        check("hostnames a.com,b.com are split",
+              _split_targets("a.com,b.com"), ["a.com", "b.com"]),
+        check("addresses and networks are split",
+              _split_targets("10.0.0.1,10.0.0.0/30"), ["10.0.0.1", "10.0.0.0/30"]),
+        check("whitespace always separates targets",
+              _split_targets("a.com  10.0.0.1-5,7"), ["a.com", "10.0.0.1-5,7"]),
+        check("nmap options in the target are rejected",
+              _rejects(_split_targets, "10.0.0.1 --script /tmp/x.nse -oN /tmp/out"), True),
+        check("an input list option is rejected",
+              _rejects(_split_targets, "-iL /etc/passwd"), True),
+        check("run_nmap reports a rejected target as an error",
+              "options are not allowed" in json.loads(run_nmap("10.0.0.1 -iL /etc/passwd"))["error"], True),
+        check("a plain address is not rewritten as a network",
+              _shard_targets(["10.0.0.1"], 4), [["10.0.0.1"]]),
+        check("a plain IPv6 address is not rewritten as a network",
+              _shard_targets(["::1"], 4), [["::1"]]),
+        check("an octet list is not sharded",
+              _shard_targets(["192.168.1,2.1"], 4), [["192.168.1,2.1"]]),
+        check("a CIDR range is split into subnets",
+              _shard_targets(["10.0.0.0/24"], 2), [["10.0.0.0/25"], ["10.0.0.128/25"]]),
+        check("targets are spread over the shards",
+              _shard_targets(["a", "b", "c"], 2), [["a", "c"], ["b"]]),
+        check("there are never more shards than targets",
+              _shard_targets(["a", "b"], 8), [["a"], ["b"]]),
+    ]
+    return all(results)
+
+
+def test_hashcat_outfile():
+    """Test how hashcat outfile lines are split into hash and plaintext."""
+    print("\n" + "="*70)
+    print("Hashcat Outfile Parsing")
+    print("="*70)
+
+    from tools.hashcat import _parse_cracked
+
+    with tempfile.NamedTemporaryFile("w", suffix=".hashes", delete=False) as f:
+        f.write("5f4dcc3b5aa765d61d8327deb882cf99\nabc123:saltsalt\n")
+    try:
+        cracked = _parse_cracked([
+            "5f4dcc3b5aa765d61d8327deb882cf99:pass:word",
+            "abc123:saltsalt:secret",
+            "unknown:plain",
+        ], f.name)
+    finally:
+        os.unlink(f.name)
+
+    # A stub hashcat that writes its -o file the way hashcat 6 does:
+    # format 1,2 is "hash[:salt]:plain", format 3 only the hex plaintext
+    stub_dir = tempfile.mkdtemp()
+    with open(os.path.join(stub_dir, "hashcat"), "w") as stub:
+        stub.write(
+            "#!/bin/sh\n"
+            "while [ $# -gt 0 ]; do case \"$1\" in\n"
+            "  -o) out=\"$2\"; shift;;\n"
+            "  --outfile-format=*) format=\"${1#*=}\";;\n"
+            "esac; shift; done\n"
+            "if [ \"$format\" = 1,2 ]; then\n"
+            "  printf 'abc123:saltsalt:secret\\n' > \"$out\"\n"
+            "else\n"
+            "  printf '736563726574\\n' > \"$out\"\n"
+            "fi\n"
+            "exit 0\n"
+        )
+    os.chmod(os.path.join(stub_dir, "hashcat"), 0o755)
+    with tempfile.NamedTemporaryFile("w", suffix=".hashes", delete=False) as f:
+        f.write("abc123:saltsalt\n")
+    # Drop any cached hashcat path so that the stub is found first
+    from tools import _runner
+    _runner._binaries.pop("hashcat", None)
+    saved_path = os.environ["PATH"]
+    os.environ["PATH"] = stub_dir + os.pathsep + saved_path
+    try:
+        from tools.hashcat import run_hashcat
+        run = json.loads(run_hashcat(f.name, os.devnull, "1410"))
+        unreadable = _parse_cracked(["abc123:saltsalt:secret"], os.path.join(stub_dir, "missing"))
+    finally:
+        os.environ["PATH"] = saved_path
+        _runner._binaries.pop("hashcat", None)
+        os.unlink(f.name)
+        shutil.rmtree(stub_dir)
+
+    results = [
+        check("run_hashcat reports what hashcat wrote to its outfile",
+              run.get("results", {}).get("cracked_hashes"), [{"hash": "abc123:saltsalt", "plain": "secret"}]),
+        check("an unreadable hash file falls back to the first colon",
+              unreadable, [{"hash": "abc123", "plain": "saltsalt:secret"}]),
+        check("an unsalted hash keeps colons in the plaintext",
+              cracked[0], {"hash": "5f4dcc3b5aa765d61d8327deb882cf99", "plain": "pass:word"}),
+        check("a salted hash keeps its salt",
+              cracked[1], {"hash": "abc123:saltsalt", "plain": "secret"}),
+        check("a line matching no entry is split at the first colon",
+              cracked[2], {"hash": "unknown", "plain": "plain"}),
+    ]
+    return all(results)
+
+
+def test_arjun_bulk_results():
+    """Test how per-URL Arjun results are aggregated."""
+    print("\n" + "="*70)
+    print("Arjun Bulk Aggregation")
+    print("="*70)
+
+    from tools.arjun import arjun_bulk_scan
+
+    report = arjun_bulk_scan(
+        ["http://a", "http://b", "http://c"],
+        [
+            {"success": True, "parameters": ["id"], "count": 1},
+            {"success": False, "error": "arjun failed"},
+            asyncio.CancelledError(),
+        ],
+        "get",
+    )
+
+    results = [
+        check("successful and failed scans are counted",
+              (report["successful_scans"], report["failed_scans"]), (1, 2)),
+        check("a cancelled scan is reported as an error",
+              report["results"]["http://c"], {"error": "CancelledError", "parameters": [], "count": 0}),
+        check("the method is reported in upper case", report["method"], "GET"),
+    ]
+    return all(results)
+
+
+def test_result_cache():
+    """Test that repeated identical calls are served from main's result cache."""
+    print("\n" + "="*70)
+    print("Result Cache")
+    print("="*70)
+
+    import main
+
+    calls = []
+
+    def backend(domain, recursive):
+        # Run for longer than the TTL, like a slow scan would
+        calls.append(domain)
+        time.sleep(0.2)
+        return '{"success":true}'
+
+    async def run():
+        first = await main.subfinder_wrapper("example.com")
+        second = await main.subfinder_wrapper("example.com")
+        after_second = len(calls)
+        await main.subfinder_wrapper("example.com", cache_bust=True)
+        return first, second, after_second
+
+    saved = main._tool, main._CACHE_TTL
+    main._tool, main._CACHE_TTL = (lambda module, name: backend), 0.1
+    main._result_cache.clear()
+    try:
+        first, second, after_second = asyncio.run(run())
+    finally:
+        main._tool, main._CACHE_TTL = saved
+        main._result_cache.clear()
+
+    results = [
+        check("the repeated call returns the same result", second, first),
+        check("the repeated call is served from the cache", after_second, 1),
+        check("cache_bust runs the scan again", len(calls), 2),
+    ]
+    return all(results)
+
+
+def main():
+    """Run all tests."""
+    results = [
+        ("Nmap Targets", test_nmap_targets()),
+        ("Hashcat Outfile", test_hashcat_outfile()),
+        ("Arjun Bulk Results", test_arjun_bulk_results()),
+        ("Result Cache", test_result_cache()),
+    ]
+
+    print("\n" + "="*70)
+    print("Test Summary")
+    print("="*70)
+
+    for name, result in results:
+        status = "✓ PASS" if result else "✗ FAIL"
+        print(f"{name:25} {status}")
+
+    passed = sum(1 for _, result in results if result)
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import json
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+# Absolute paths of the tool binaries, resolved once per process
+_binaries: Dict[str, str] = {}
+
+
+def which(name: str) -> Optional[str]:
+    """Return the absolute path of a tool binary, or None if it is not installed.
+
+    The PATH lookup is done once and cached. A binary that is missing (or that
+    disappeared since it was cached) is looked up again on the next call, so a
+    tool installed while the server is running is picked up.
+    """
+    path = _binaries.get(name)
+    if path and os.access(path, os.X_OK):
+        return path
+    path = shutil.which(name)
+    if path:
+        _binaries[name] = path
+    else:
+        _binaries.pop(name, None)
+    return path
+
+
+def not_installed(name: str) -> Dict[str, Any]:
+    """Error result for a tool whose binary which() could not find."""
+    return {"success": False, "error": f"{name} not found. Please install {name} and make sure it is on PATH"}
+
+
+def dumps(result) -> str:
+    """Serialize a tool result compactly; MCP clients do not need indentation."""
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+
+
+def kill_group(proc: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session=True, along with any
+    processes it spawned, so that nothing is left running after a timeout."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class ToolResult(NamedTuple):
+    """Outcome of run_tool()."""
+    cmd: List[str]
+    returncode: int
+    stdout: Union[str, bytes]  # with parse_ndjson, only the lines that were not JSON
+    stderr: str
+    records: List[Any]  # decoded JSON lines, with parse_ndjson
+    timed_out: bool
+
+
+def run_tool(
+    cmd: List[str],
+    *,
+    input: Optional[str] = None,
+    timeout: Optional[float] = None,
+    check: bool = False,
+    parse_ndjson: bool = False,
+    text: bool = True,
+    on_start: Optional[Callable[[subprocess.Popen], None]] = None,
+) -> ToolResult:
+    """Run a tool binary and collect its output.
+    
+    stdin is never inherited - in an MCP stdio server it carries the JSON-RPC
+    stream, and several tools read piped stdin as a target list - so it is
+    either input or empty. The tool runs in its own session; at the timeout
+    it is killed together with anything it spawned, and the output produced
+    so far is returned with timed_out set.
+    
+    stdout is spooled to a temporary file rather than buffered in memory. With
+    parse_ndjson it is instead decoded as the tool emits it, one JSON object
+    per line. With check, a non-zero exit raises CalledProcessError.
+    
+    on_start is called with the Popen object once the tool has been started,
+    for callers that may need to stop it early.
+    """
+    with tempfile.TemporaryFile() as stderr_file:
+        if parse_ndjson:
+            returncode, stdout, records, timed_out = _stream_ndjson(cmd, input, timeout, stderr_file, on_start)
+        else:
+            returncode, stdout, timed_out = _spool(cmd, input, timeout, stderr_file, text, on_start)
+            records = []
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors="replace")
+    
+    if check and returncode != 0 and not timed_out:
+        raise subprocess.CalledProcessError(returncode, cmd, output=stdout, stderr=stderr)
+    return ToolResult(cmd, returncode, stdout, stderr, records, timed_out)
+
+
+def _spool(cmd, input, timeout, stderr_file, text, on_start):
+    with tempfile.TemporaryFile(mode="w+" if text else "w+b") as stdout_file:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+            stdout=stdout_file,
+            stderr=stderr_file,
+            text=text,
+            start_new_session=True
+        )
+        if on_start:
+            on_start(proc)
+        timed_out = False
+        try:
+            proc.communicate(input, timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            kill_group(proc)
+            proc.communicate()
+        stdout_file.seek(0)
+        return proc.returncode, stdout_file.read(), timed_out
+
+
+def _stream_ndjson(cmd, input, timeout, stderr_file, on_start):
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=stderr_file,
+        text=True,
+        start_new_session=True
+    )
+    if on_start:
+        on_start(proc)
+    
+    # Kill the tool and anything it spawned at the deadline, even if the tool
+    # itself has exited: a child still holding stdout would otherwise keep the
+    # read loop below waiting. Once the loop has finished, the timer no longer
+    # kills anything; the remaining wait has its own deadline.
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    timer_lock = threading.Lock()
+    fired = False
+    done = False
+    
+    def kill_on_timeout():
+        nonlocal fired
+        with timer_lock:
+            if not done:
+                fired = True
+                kill_group(proc)
+    
+    # Feed stdin from another thread, so a tool that writes results while it
+    # is still reading its input cannot block on a full stdout pipe
+    def feed():
+        try:
+            proc.stdin.write(input)
+            proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            # The tool exited early; its exit status is reported instead
+            pass
+    
+    timer = threading.Timer(timeout, kill_on_timeout) if timeout is not None else None
+    try:
+        if timer:
+            timer.start()
+        if input is not None:
+            threading.Thread(target=feed, daemon=True).start()
+        
+        records = []
+        unparsed = []
+        for line in proc.stdout:
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Keep non-JSON lines for error reporting
+                    unparsed.append(line)
+        with timer_lock:
+            done = True
+        timed_out = fired
+        if not timed_out:
+            try:
+                proc.wait(None if deadline is None else max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                timed_out = True
+    finally:
+        if timer:
+            timer.cancel()
+        if proc.poll() is None:
+            kill_group(proc)
+            proc.wait()
+        proc.stdout.close()
+    
+    return proc.returncode, "".join(unparsed), records, timed_out
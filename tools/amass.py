@@ -2,6 +2,8 @@ import subprocess
 import json
 from typing import Optional, Dict, Any
 
+from tools._runner import not_installed, which
+
 def amass_wrapper(domain: str, passive: bool = True) -> Dict[str, Any]:
     """
     Wrapper for Amass subdomain enumeration tool.
@@ -14,8 +16,12 @@ def amass_wrapper(domain: str, passive: bool = True) -> Dict[str, Any]:
         Dict[str, Any]: Results containing discovered subdomains and related information
     """
     try:
+        binary = which("amass")
+        if binary is None:
+            return not_installed("amass")
+        
         # Build the command
-        cmd = ["amass", "enum"]
+        cmd = [binary, "enum"]
         if passive:
             cmd.append("-passive")
         cmd.extend(["-d", domain, "-json", "-"])
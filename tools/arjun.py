@@ -2,6 +2,8 @@ import subprocess
 import json
 from typing import Optional, Dict, Any, List
 
+from tools._runner import not_installed, which
+
 def arjun_wrapper(
     url: str,
     method: str = "GET",
@@ -33,8 +35,12 @@ def arjun_wrapper(
         Dict[str, Any]: Results containing discovered parameters
     """
     try:
+        binary = which("arjun")
+        if binary is None:
+            return not_installed("arjun")
+        
         # Build the command
-        cmd = ["arjun", "-u", url]
+        cmd = [binary, "-u", url]
         
         # Add method
         cmd.extend(["-m", method.upper()])
@@ -122,20 +128,17 @@ def arjun_wrapper(
 
 def arjun_bulk_scan(
     urls: List[str],
-    method: str = "GET",
-    wordlist: Optional[str] = None,
-    threads: int = 25,
-    stable: bool = False
+    results: List[Any],
+    method: str = "GET"
 ) -> Dict[str, Any]:
     """
-    Enhanced Arjun wrapper for scanning multiple URLs.
+    Aggregate the Arjun results of several URLs into a single report.
     
     Args:
-        urls (List[str]): List of target URLs to scan
-        method (str): HTTP method to use
-        wordlist (str): Custom wordlist file path
-        threads (int): Number of threads to use
-        stable (bool): Use stable mode
+        urls (List[str]): List of scanned URLs
+        results (List[Any]): arjun_wrapper result for each URL, in the same order;
+            an exception in place of a result counts as a failed scan
+        method (str): HTTP method that was used
         
     Returns:
         Dict[str, Any]: Aggregated results from all scanned URLs
@@ -144,14 +147,11 @@ def arjun_bulk_scan(
     successful_scans = 0
     failed_scans = 0
     
-    for url in urls:
-        result = arjun_wrapper(
-            url=url,
-            method=method,
-            wordlist=wordlist,
-            threads=threads,
-            stable=stable
-        )
+    for url, result in zip(urls, results):
+        # BaseException, since gather(return_exceptions=True) can also
+        # return CancelledError
+        if isinstance(result, BaseException):
+            result = {"success": False, "error": str(result) or type(result).__name__}
         
         if result["success"]:
             all_results[url] = {
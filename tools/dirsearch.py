@@ -2,6 +2,8 @@ import subprocess
 import json
 from typing import Optional, List, Dict, Any
 
+from tools._runner import not_installed, which
+
 def dirsearch_wrapper(url: str, extensions: Optional[List[str]] = None, wordlist: Optional[str] = None) -> Dict[str, Any]:
     """
     Wrapper for Dirsearch directory and file brute forcer.
@@ -15,8 +17,12 @@ def dirsearch_wrapper(url: str, extensions: Optional[List[str]] = None, wordlist
         Dict[str, Any]: Results containing discovered paths and their status codes
     """
     try:
+        binary = which("dirsearch")
+        if binary is None:
+            return not_installed("dirsearch")
+        
         # Build the command
-        cmd = ["dirsearch", "-u", url, "--json-report", "-"]
+        cmd = [binary, "-u", url, "--json-report", "-"]
         
         if extensions:
             cmd.extend(["-e", ",".join(extensions)])
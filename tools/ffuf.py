@@ -2,6 +2,8 @@ import subprocess
 import json
 from typing import Optional, Dict, Any
 
+from tools._runner import not_installed, which
+
 
 def run_ffuf(
     url: str,
@@ -19,8 +21,12 @@ def run_ffuf(
         str: JSON string containing fuzzing results
     """
     try:
+        binary = which("ffuf")
+        if binary is None:
+            return json.dumps(not_installed("ffuf"))
+        
         # Build the command
-        cmd = ["ffuf", "-u", url, "-w", wordlist, "-fc", filter_code, "-o", "-", "-of", "json"]
+        cmd = [binary, "-u", url, "-w", wordlist, "-fc", filter_code, "-o", "-", "-of", "json"]
         
         # Run the command
         result = subprocess.run(
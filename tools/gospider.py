@@ -2,6 +2,8 @@ import subprocess
 import json
 from typing import Optional, Dict, Any, List
 
+from tools._runner import not_installed, which
+
 def gospider_wrapper(
     target: str, 
     depth: int = 3, 
@@ -31,8 +33,12 @@ def gospider_wrapper(
         Dict[str, Any]: Results containing discovered URLs and related information
     """
     try:
+        binary = which("gospider")
+        if binary is None:
+            return not_installed("gospider")
+        
         # Build the command
-        cmd = ["gospider", "-s", target]
+        cmd = [binary, "-s", target]
         
         # Add options
         cmd.extend(["-d", str(depth)])
@@ -1,6 +1,35 @@
-import subprocess
-import json
-from typing import Optional, Dict, Any
+import os
+import tempfile
+from typing import List, Optional, Dict, Any
+
+from tools._runner import dumps, not_installed, run_tool, which
+
+# Seconds before a hashcat run is killed
+_TIMEOUT = 3600
+
+
+def _parse_cracked(lines: List[str], hash_file: str) -> List[Dict[str, str]]:
+    """Split "hash:plain" outfile lines into their hash and plaintext.
+    
+    For salted modes the hash part itself contains colons (e.g. "hash:salt"),
+    so each line is split after the longest prefix that is an entry of
+    hash_file. Lines that match no entry, or all lines if hash_file cannot be
+    read, are split at the first colon.
+    """
+    try:
+        with open(hash_file, errors="replace") as f:
+            known = {line.strip().lower() for line in f if line.strip()}
+    except OSError:
+        known = set()
+    
+    cracked = []
+    for line in lines:
+        split = line.index(":")
+        for i, char in enumerate(line):
+            if char == ":" and line[:i].lower() in known:
+                split = i
+        cracked.append({"hash": line[:split], "plain": line[split + 1:]})
+    return cracked
 
 
 def run_hashcat(
@@ -31,37 +60,62 @@ def run_hashcat(
         
         mode = hash_mode_map.get(hash_type.lower(), hash_type)
         
-        # Build the command
-        cmd = ["hashcat", "-m", str(mode), "--potfile-disable", "--outfile-format=2", hash_file, wordlist]
+        binary = which("hashcat")
+        if binary is None:
+            return dumps(not_installed("hashcat"))
+        
+        # Cracked hashes are written as "hash[:salt]:plain" lines (outfile
+        # format 1,2 - hashcat 6 format 3 would be the hex plaintext alone)
+        # to a file we control, separate from hashcat's progress output
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pot") as f:
+            outfile = f.name
         
-        # Run the command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        try:
+            # Build the command
+            cmd = [
+                binary, "-m", str(mode), "--potfile-disable",
+                "-o", outfile, "--outfile-format=1,2",
+                hash_file, wordlist
+            ]
+            
+            # Run the command, spooling its output to a temporary file instead of
+            # buffering it in memory. A non-zero exit does not discard the output.
+            result = run_tool(cmd, timeout=_TIMEOUT)
+            output = result.stdout
+            
+            # Parse the cracked hashes
+            with open(outfile) as f:
+                lines = [line.rstrip("\n") for line in f if ":" in line]
+            cracked = _parse_cracked(lines, hash_file) if lines else []
+        finally:
+            os.unlink(outfile)
         
-        # Parse the output
-        return json.dumps({
-            "success": True,
+        # hashcat exits with 1 when the wordlist is exhausted without cracking everything
+        success = not result.timed_out and result.returncode in (0, 1)
+        
+        response = {
+            "success": success,
             "hash_file": hash_file,
             "hash_type": hash_type,
             "mode": mode,
+            "returncode": result.returncode,
             "results": {
-                "output": result.stdout,
-                "cracked_hashes": []  # Hashcat output format 2 would be parsed here
+                "cracked_hashes": cracked,
+                "count": len(cracked)
             }
-        })
+        }
+        if not success:
+            # hashcat reports most errors on stdout
+            if result.timed_out:
+                response["error"] = f"hashcat timed out after {_TIMEOUT} seconds"
+            else:
+                response["error"] = f"hashcat exited with status {result.returncode}"
+            response["output"] = output
+            response["stderr"] = result.stderr
+        return dumps(response)
         
-    except subprocess.CalledProcessError as e:
-        return json.dumps({
-            "success": False,
-            "error": str(e),
-            "stderr": e.stderr
-        })
     except Exception as e:
-        return json.dumps({
+        return dumps({
             "success": False,
             "error": str(e)
         })
\ No newline at end of file
@@ -1,7 +1,17 @@
 import subprocess
-import json
+import re
 from typing import List, Optional, Dict, Any
 
+from tools._runner import dumps, run_tool, which
+
+# Error output phrases of the Python httpx CLI, which shadows projectdiscovery httpx
+_HTTPX_WRONG_BINARY_RE = re.compile(
+    r"command line client could not run|required dependencies|pip install 'httpx\[cli\]'"
+)
+_HTTPX_MISSING_RE = re.compile(r"no such file|not found")
+
+_HTTPX_NOT_FOUND = "httpx tool not found. Please install projectdiscovery httpx: go install -v github.com/projectdiscovery/httpx/cmd/httpx@latest"
+
 
 def run_httpx(
     targets: List[str],
@@ -29,17 +39,21 @@ def run_httpx(
     """
     try:
         if not targets or len(targets) == 0:
-            return json.dumps({
+            return dumps({
                 "success": False,
                 "error": "No targets provided. Please provide at least one URL or IP address."
-            }, indent=2)
+            })
+        
+        binary = which("httpx")
+        if binary is None:
+            return dumps({"success": False, "error": _HTTPX_NOT_FOUND})
         
         # Build the command
         # For projectdiscovery httpx:
         # - Single URL: use -u flag
         # - Multiple URLs: use -l - (stdin) or pass as positional arguments
         # We'll use stdin for multiple URLs, or -u for single URL
-        cmd = ["httpx", "-json", "-silent"]
+        cmd = [binary, "-json", "-silent"]
         
         # Add timeout flag - confirmed supported in httpx v1.3.4
         # Default is 10s, we'll use 10s to match default behavior
@@ -61,7 +75,7 @@ def run_httpx(
         else:
             # Multiple URLs: use stdin
             cmd.extend(["-l", "-"])
-            input_data = "\n".join(targets)
+            input_data = "\n".join(targets) + "\n"
         
         # Run the command with timeout to prevent hanging
         # Set timeout based on number of targets
@@ -70,81 +84,61 @@ def run_httpx(
         # Note: If httpx hangs, it's likely due to invalid flags or network issues
         timeout_seconds = max(20, (15 * len(targets)) + 20)
         
-        try:
-            result = subprocess.run(
-                cmd,
-                input=input_data,  # Pass URLs via stdin if multiple, None if single URL
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=timeout_seconds
-            )
-        except subprocess.TimeoutExpired:
-            return json.dumps({
+        # httpx prints one JSON object per line, so each result is parsed as
+        # soon as httpx emits it
+        result = run_tool(cmd, input=input_data, timeout=timeout_seconds, check=True, parse_ndjson=True)
+        if result.timed_out:
+            return dumps({
                 "success": False,
                 "error": f"httpx scan timed out after {timeout_seconds} seconds. The httpx tool may be hanging or the target is unreachable. Command: {' '.join(cmd)}",
                 "targets": targets,
                 "timeout_seconds": timeout_seconds,
                 "suggestion": "The site may be slow, or httpx may be waiting for a response. Try checking network connectivity or scanning a different URL."
-            }, indent=2)
-        
-        # Parse the output - httpx outputs one JSON object per line
-        output_lines = result.stdout.strip().split('\n')
-        results = []
-        for line in output_lines:
-            if line.strip():
-                try:
-                    results.append(json.loads(line))
-                except json.JSONDecodeError:
-                    # Skip invalid JSON lines
-                    continue
+            })
+        results = result.records
         
-        return json.dumps({
+        return dumps({
             "success": True,
             "targets": targets,
             "results": results,
             "count": len(results)
-        }, indent=2)
+        })
         
     except subprocess.CalledProcessError as e:
         # Check if it's the wrong httpx binary (Python httpx vs projectdiscovery httpx)
         error_msg = (e.stderr or "") + (e.stdout or "") + str(e)
         error_lower = error_msg.lower()
         
-        if any(phrase in error_lower for phrase in [
-            "command line client could not run",
-            "required dependencies",
-            "pip install 'httpx[cli]'"
-        ]):
-            return json.dumps({
+        if _HTTPX_WRONG_BINARY_RE.search(error_lower):
+            return dumps({
                 "success": False,
                 "error": "Wrong httpx binary detected. Please install projectdiscovery httpx (not Python httpx). Install with: go install -v github.com/projectdiscovery/httpx/cmd/httpx@latest",
                 "stderr": e.stderr,
                 "stdout": e.stdout
-            }, indent=2)
+            })
         
         # Check if httpx tool is not found
-        if "no such file" in error_lower or "not found" in error_lower:
-            return json.dumps({
+        if _HTTPX_MISSING_RE.search(error_lower):
+            return dumps({
                 "success": False,
-                "error": "httpx tool not found. Please install projectdiscovery httpx: go install -v github.com/projectdiscovery/httpx/cmd/httpx@latest",
+                "error": _HTTPX_NOT_FOUND,
                 "stderr": e.stderr,
                 "stdout": e.stdout
-            }, indent=2)
+            })
         
-        return json.dumps({
+        return dumps({
             "success": False,
             "error": f"httpx execution failed: {e.stderr or str(e)}",
             "stderr": e.stderr,
             "stdout": e.stdout
-        }, indent=2)
+        })
     except FileNotFoundError:
-        return json.dumps({
+        return dumps({
             "success": False,
-            "error": "httpx tool not found. Please install projectdiscovery httpx: go install -v github.com/projectdiscovery/httpx/cmd/httpx@latest"
-        }, indent=2)
+            "error": _HTTPX_NOT_FOUND
+        })
     except Exception as e:
-        return json.dumps({
+        return dumps({
             "success": False,
             "error": f"Unexpected error: {str(e)}"
-        }, indent=2)
\ No newline at end of file
+        })
\ No newline at end of file
@@ -1,59 +1,245 @@
 import subprocess
-import json
+import io
+import ipaddress
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional, Dict, Any
 
+from tools._runner import dumps, kill_group, not_installed, run_tool, which
+
+# Seconds before an nmap process (one per shard) is killed
+_TIMEOUT = 1800
+
+# A DNS name whose last label starts with a letter, so that partial addresses
+# such as "192.168.1" or "2.1" are never taken for one
+_HOSTNAME_RE = re.compile(
+    r"(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)*"
+    r"[A-Za-z](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.?"
+)
+
+
+def _is_host(part: str) -> bool:
+    """Check whether part is a complete IP address, network or hostname."""
+    try:
+        if "/" in part:
+            ipaddress.ip_network(part, strict=False)
+        else:
+            ipaddress.ip_address(part)
+        return True
+    except ValueError:
+        return len(part) <= 253 and _HOSTNAME_RE.fullmatch(part) is not None
+
+
+def _split_targets(target: str) -> List[str]:
+    """Split a target specification into independently scannable targets.
+    
+    Whitespace always separates targets. Commas separate targets only when every
+    part is a complete address, network or hostname; anything else, such as the
+    nmap octet lists "192.168.1,2.1" or "10.0.0.1-5,7", is passed on unchanged.
+    
+    Raises ValueError for a token that nmap would read as an option (such as
+    "--script" or "-iL"), since each target becomes its own nmap argument.
+    """
+    targets = []
+    for token in target.split():
+        if token.startswith("-"):
+            raise ValueError(f"Invalid target {token!r}: nmap options are not allowed in the target")
+        parts = [part for part in token.split(",") if part]
+        if len(parts) > 1 and all(_is_host(part) for part in parts):
+            targets.extend(parts)
+        else:
+            targets.append(token)
+    return targets or [target]
+
+
+def _shard_targets(targets: List[str], shards: int) -> List[List[str]]:
+    """Partition targets into at most `shards` groups for parallel nmap runs.
+    
+    A single CIDR range is first split into equally sized subnets so that it can
+    be spread across the shards as well.
+    """
+    if len(targets) == 1 and shards > 1 and "/" in targets[0]:
+        try:
+            network = ipaddress.ip_network(targets[0], strict=False)
+        except ValueError:
+            return [targets]
+        extra_bits = min((shards - 1).bit_length(), network.max_prefixlen - network.prefixlen)
+        targets = [str(subnet) for subnet in network.subnets(prefixlen_diff=extra_bits)]
+    
+    shards = max(1, min(shards, len(targets)))
+    return [targets[i::shards] for i in range(shards)]
+
+
+def _parse_hosts(xml_output: bytes) -> List[Dict[str, Any]]:
+    """Extract hosts and their ports from an nmap XML report.
+    
+    The report is parsed incrementally and each <host> element is cleared once
+    it has been read, so memory stays bounded for large scans.
+    """
+    hosts = []
+    for _, elem in ET.iterparse(io.BytesIO(xml_output), events=("end",)):
+        if elem.tag != "host":
+            continue
+        
+        ports = []
+        for port in elem.iterfind("ports/port"):
+            state = port.find("state")
+            service = port.find("service")
+            version = None
+            if service is not None:
+                version = " ".join(filter(None, (service.get("product"), service.get("version")))) or None
+            ports.append({
+                "port": int(port.get("portid")),
+                "protocol": port.get("protocol"),
+                "state": state.get("state") if state is not None else None,
+                "service": service.get("name") if service is not None else None,
+                "version": version
+            })
+        
+        address = elem.find("address")
+        status = elem.find("status")
+        hosts.append({
+            "addr": address.get("addr") if address is not None else None,
+            "hostnames": [hostname.get("name") for hostname in elem.iterfind("hostnames/hostname")],
+            "status": status.get("state") if status is not None else None,
+            "ports": ports
+        })
+        elem.clear()
+    return hosts
+
+
+def _merge_xml(outputs: List[bytes]) -> str:
+    """Merge the XML reports of several nmap runs into a single report."""
+    root = ET.fromstring(outputs[0])
+    runstats = root.find("runstats")
+    hosts_stats = runstats.find("hosts") if runstats is not None else None
+    
+    for output in outputs[1:]:
+        other = ET.fromstring(output)
+        for host in other.iter("host"):
+            # Keep <runstats> as the last element, as nmap does
+            if runstats is not None:
+                root.insert(list(root).index(runstats), host)
+            else:
+                root.append(host)
+        other_stats = other.find("runstats/hosts")
+        if hosts_stats is not None and other_stats is not None:
+            for key in ("up", "down", "total"):
+                hosts_stats.set(key, str(int(hosts_stats.get(key, 0)) + int(other_stats.get(key, 0))))
+    
+    return ET.tostring(root, encoding="unicode", xml_declaration=True)
+
 
 def run_nmap(
     target: str,
     ports: Optional[str] = None,
     scan_type: Optional[str] = "sV",
+    raw: bool = False,
 ) -> str:
     """Run an Nmap network scan on the specified target.
     
+    Multiple targets (separated by whitespace or commas) and CIDR ranges are
+    sharded across parallel nmap processes, one per CPU, and their reports merged.
+    
     Args:
-        target: The target IP or hostname to scan
+        target: The target IP, hostname, CIDR range, or list of them to scan
         ports: Specific ports to scan (e.g., "22,80,443")
         scan_type: Scan type options (e.g., "sV" for version detection, "sS" for SYN scan)
+        raw: Also include the nmap XML report in the results (default: False)
     
     Returns:
-        str: JSON string containing scan results
+        str: JSON string containing the scanned hosts with their ports and services
     """
     try:
-        # Build the command
-        cmd = ["nmap", "-oX", "-", target]  # Output in XML format to stdout
+        # Validate the targets before anything is run
+        targets = _split_targets(target)
+        
+        binary = which("nmap")
+        if binary is None:
+            return dumps(not_installed("nmap"))
+        
+        # Build the command options
+        options = []
         if ports:
-            cmd.extend(["-p", ports])
+            options.extend(["-p", ports])
         if scan_type:
             # Add scan type as a single flag (e.g., "sV" becomes "-sV")
-            cmd.append(f"-{scan_type}")
-        
-        # Run the command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        # Parse the output
-        return json.dumps({
+            options.append(f"-{scan_type}")
+        
+        # nmap processes of the shards, so that the remaining ones can be
+        # stopped as soon as one of them fails
+        procs = []
+        procs_lock = threading.Lock()
+        failed = threading.Event()
+        
+        def track(proc):
+            with procs_lock:
+                procs.append(proc)
+            if failed.is_set():
+                kill_group(proc)
+        
+        def stop_all():
+            failed.set()
+            with procs_lock:
+                for proc in procs:
+                    if proc.poll() is None:
+                        kill_group(proc)
+        
+        def scan(hosts: List[str]) -> bytes:
+            # Output in XML format to stdout, kept as bytes: the parser reads
+            # them directly, so the report is not decoded into a str first
+            cmd = [binary, "-oX", "-", *hosts, *options]
+            result = run_tool(cmd, timeout=_TIMEOUT, check=True, text=False, on_start=track)
+            if result.timed_out:
+                raise subprocess.TimeoutExpired(cmd, _TIMEOUT)
+            return result.stdout
+        
+        # Run the command, in parallel when there is more than one shard
+        shards = _shard_targets(targets, os.cpu_count() or 1)
+        if len(shards) == 1:
+            outputs = [scan(shards[0])]
+        else:
+            outputs = [None] * len(shards)
+            with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                futures = {executor.submit(scan, shard): i for i, shard in enumerate(shards)}
+                for future in as_completed(futures):
+                    try:
+                        outputs[futures[future]] = future.result()
+                    except Exception:
+                        stop_all()
+                        raise
+        
+        # Parse the output into hosts, ports and services
+        results = {
+            "hosts": [host for output in outputs for host in _parse_hosts(output)]
+        }
+        if raw:
+            results["xml_output"] = outputs[0].decode() if len(outputs) == 1 else _merge_xml(outputs)
+        
+        return dumps({
             "success": True,
             "target": target,
             "ports": ports,
             "scan_type": scan_type,
-            "results": {
-                "xml_output": result.stdout
-            }
+            "results": results
         })
         
     except subprocess.CalledProcessError as e:
-        return json.dumps({
+        return dumps({
             "success": False,
             "error": str(e),
             "stderr": e.stderr
         })
+    except subprocess.TimeoutExpired:
+        return dumps({
+            "success": False,
+            "error": f"nmap scan timed out after {_TIMEOUT} seconds"
+        })
     except Exception as e:
-        return json.dumps({
+        return dumps({
             "success": False,
             "error": str(e)
-        })
\ No newline at end of file
+        })
@@ -3,6 +3,8 @@ import subprocess
 import json
 from typing import List, Optional, Dict, Any
 
+from tools._runner import not_installed, which
+
 
 def run_nuclei(
     target: str,
@@ -22,8 +24,12 @@ def run_nuclei(
         str: JSON string containing scan results
     """
     try:
+        binary = which("nuclei")
+        if binary is None:
+            return json.dumps(not_installed("nuclei"))
+        
         # Build the command
-        cmd = ["nuclei", "-u", target, "-json"]
+        cmd = [binary, "-u", target, "-json"]
         
         # Add template filters if specified
         if templates:
@@ -1,7 +1,10 @@
-import subprocess
-import json
 from typing import List, Optional, Dict, Any
 
+from tools._runner import dumps, not_installed, run_tool, which
+
+# Seconds before a sqlmap run is killed
+_TIMEOUT = 1800
+
 
 def run_sqlmap(
     url: str,
@@ -19,40 +22,45 @@ def run_sqlmap(
         str: JSON string containing scan results
     """
     try:
+        binary = which("sqlmap")
+        if binary is None:
+            return dumps(not_installed("sqlmap"))
+        
         # Build the command
-        cmd = ["sqlmap", "-u", url, "--batch", "--output-dir=/tmp/sqlmap"]
+        cmd = [binary, "-u", url, "--batch", "--output-dir=/tmp/sqlmap"]
         if risk:
             cmd.extend(["--risk", str(risk)])
         if level:
             cmd.extend(["--level", str(level)])
         
-        # Run the command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        # Run the command, spooling its output to a temporary file instead of
+        # buffering it in memory. A non-zero exit does not discard the output.
+        result = run_tool(cmd, timeout=_TIMEOUT)
+        output = result.stdout
+        
+        success = not result.timed_out and result.returncode == 0
         
         # Parse the output
-        return json.dumps({
-            "success": True,
+        response = {
+            "success": success,
             "url": url,
             "risk": risk,
             "level": level,
+            "returncode": result.returncode,
             "results": {
-                "output": result.stdout
+                "output": output
             }
-        })
+        }
+        if not success:
+            if result.timed_out:
+                response["error"] = f"sqlmap timed out after {_TIMEOUT} seconds"
+            else:
+                response["error"] = f"sqlmap exited with status {result.returncode}"
+            response["stderr"] = result.stderr
+        return dumps(response)
         
-    except subprocess.CalledProcessError as e:
-        return json.dumps({
-            "success": False,
-            "error": str(e),
-            "stderr": e.stderr
-        })
     except Exception as e:
-        return json.dumps({
+        return dumps({
             "success": False,
             "error": str(e)
         })
\ No newline at end of file
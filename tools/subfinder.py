@@ -1,7 +1,11 @@
 import subprocess
-import json
 from typing import Optional, Dict, Any
 
+from tools._runner import dumps, not_installed, run_tool, which
+
+# Seconds before a subfinder run is killed
+_TIMEOUT = 900
+
 
 def run_subfinder(
     domain: str,
@@ -17,45 +21,42 @@ def run_subfinder(
         str: JSON string containing enumeration results
     """
     try:
+        binary = which("subfinder")
+        if binary is None:
+            return dumps(not_installed("subfinder"))
+        
         # Build the command
-        cmd = ["subfinder", "-d", domain, "-json"]
+        cmd = [binary, "-d", domain, "-json"]
         if recursive:
             cmd.append("-recursive")
         
-        # Run the command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        # Run the command, parsing its output as it streams - subfinder
+        # outputs one JSON object per line
+        result = run_tool(cmd, timeout=_TIMEOUT, check=True, parse_ndjson=True)
+        if result.timed_out:
+            return dumps({
+                "success": False,
+                "error": f"subfinder timed out after {_TIMEOUT} seconds",
+                "subdomains": result.records
+            })
+        subdomains = result.records
         
-        # Parse the output - subfinder outputs one JSON object per line
-        subdomains = []
-        for line in result.stdout.strip().split('\n'):
-            if line.strip():
-                try:
-                    data = json.loads(line)
-                    subdomains.append(data)
-                except json.JSONDecodeError:
-                    continue
-        
-        return json.dumps({
+        return dumps({
             "success": True,
             "domain": domain,
             "recursive": recursive,
             "subdomains": subdomains,
             "count": len(subdomains)
-        }, indent=2)
+        })
         
     except subprocess.CalledProcessError as e:
-        return json.dumps({
+        return dumps({
             "success": False,
             "error": str(e),
             "stderr": e.stderr
         })
     except Exception as e:
-        return json.dumps({
+        return dumps({
             "success": False,
             "error": str(e)
         })
\ No newline at end of file
@@ -2,6 +2,8 @@ import subprocess
 import json
 from typing import Optional, Dict, Any
 
+from tools._runner import not_installed, which
+
 
 def run_tlsx(host: str, port: Optional[int] = 443) -> str:
     """
@@ -15,8 +17,12 @@ def run_tlsx(host: str, port: Optional[int] = 443) -> str:
         str: JSON string containing TLS analysis results
     """
     try:
+        binary = which("tlsx")
+        if binary is None:
+            return json.dumps(not_installed("tlsx"))
+        
         # Build the command
-        cmd = ["tlsx", "-host", host, "-port", str(port), "-json"]
+        cmd = [binary, "-host", host, "-port", str(port), "-json"]
         
         # Run the command
         result = subprocess.run(
@@ -2,6 +2,8 @@ import subprocess
 import json
 from typing import Optional, Dict, Any
 
+from tools._runner import not_installed, which
+
 
 def run_wfuzz(
     url: str,
@@ -19,8 +21,12 @@ def run_wfuzz(
         str: JSON string containing fuzzing results
     """
     try:
+        binary = which("wfuzz")
+        if binary is None:
+            return json.dumps(not_installed("wfuzz"))
+        
         # Build the command
-        cmd = ["wfuzz", "-w", wordlist, "--hc", hide_code, "-f", "json", url]
+        cmd = [binary, "-w", wordlist, "--hc", hide_code, "-f", "json", url]
         
         # Run the command
         result = subprocess.run(